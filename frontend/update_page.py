@@ -1,9 +1,45 @@
 #!/usr/bin/env python3
-import re
+import io
+import os
+import shutil
+import tempfile
+
+PAGE_PATH = 'src/routes/tournament/+page.svelte'
+CHUNK_SIZE = 1 << 16
+
+
+def rewrite_stream(src, dst, edits):
+    """Copy src to dst chunk by chunk, replacing the first occurrence of each
+    (old, new) literal pair. Returns the number of edits applied."""
+    pending = list(edits)
+    # Hold back enough trailing text that a needle is never split across chunks
+    keep = max(len(old) for old, _ in pending) - 1
+    applied = 0
+    buf = ""
+    while True:
+        chunk = src.read(CHUNK_SIZE)
+        buf += chunk
+        while pending:
+            hits = [(buf.find(old), n) for n, (old, _) in enumerate(pending)]
+            hits = [h for h in hits if h[0] >= 0]
+            if not hits:
+                break
+            i, n = min(hits)
+            if chunk and i + keep >= len(buf):
+                # A longer needle starting at or before i may not be fully read yet
+                break
+            old, new = pending.pop(n)
+            dst.write(buf[:i])
+            dst.write(new)
+            buf = buf[i + len(old):]
+            applied += 1
+        if not chunk:
+            dst.write(buf)
+            return applied
+        if len(buf) > keep:
+            dst.write(buf[:len(buf) - keep])
+            buf = buf[len(buf) - keep:]
 
-# Read the file
-with open('src/routes/tournament/+page.svelte', 'r') as f:
-    content = f.read()
 
 # 1. Update recent matches to show bot names
 old_match_display = """{#each tournamentStore.recentMatches.slice(0, 20) as match}
@@ -37,8 +73,6 @@ new_match_display = """{#each tournamentStore.recentMatches.slice(0, 20) as matc
 								</div>
 							{/each}"""
 
-content = content.replace(old_match_display, new_match_display)
-
 # 2. Update engine stats to 2 rows (grid-cols-4 -> grid-cols-6, 2 rows of 3)
 old_stats = """<!-- Engine Stats -->
 						{#if tournamentStore.state.currentMatch?.lastMoveStats}
@@ -108,10 +142,19 @@ new_stats = """<!-- Engine Stats -->
 							</div>
 						{/if}"""
 
-content = content.replace(old_stats, new_stats)
-
-# Write back
-with open('src/routes/tournament/+page.svelte', 'w') as f:
-    f.write(content)
+# Stream the page through both edits into a temp file, then swap it in atomically
+fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(PAGE_PATH), suffix='.tmp')
+try:
+    with io.open(PAGE_PATH, 'r', buffering=CHUNK_SIZE) as src, os.fdopen(fd, 'w') as dst:
+        applied = rewrite_stream(src, dst, [(old_match_display, new_match_display), (old_stats, new_stats)])
+    if applied:
+        shutil.copymode(PAGE_PATH, tmp_path)
+        os.replace(tmp_path, PAGE_PATH)
+    else:
+        # Nothing matched: leave the page (and its mtime) alone so Vite doesn't reload it
+        os.remove(tmp_path)
+except BaseException:
+    os.remove(tmp_path)
+    raise
 
-print("Done")
+print("Done" if applied else "Already up to date")
@@ -1,50 +1,111 @@
 #!/usr/bin/env python3
-content = """import * as signalR from "@microsoft/signalr";
+import hashlib
+
+# Pure-ASCII payload kept as bytes so it is written as-is with no per-run encode
+content = b"""import * as signalR from "@microsoft/signalr";
+import { SvelteMap } from "svelte/reactivity";
+import { GameConfig } from "$lib/config/gameConfig";
 
 type TournamentStatus = "idle" | "running" | "paused" | "completed";
 type Player = "none" | "red" | "blue";
 type AIDifficulty = "beginner" | "easy" | "normal" | "medium" | "hard" | "harder" | "veryHard" | "expert" | "master" | "grandmaster" | "legend";
 
+// Backend enum values indexed directly by their numeric code (difficulty codes start at 1)
+const STATUS_BY_CODE: readonly TournamentStatus[] = ["idle", "running", "paused", "completed"];
+const DIFFICULTY_BY_CODE: readonly AIDifficulty[] = ["beginner", "beginner", "easy", "normal", "medium", "hard", "harder", "veryHard", "expert", "master", "grandmaster", "legend"];
+
 function mapStatusFromBackend(status: number | string): TournamentStatus {
   if (typeof status === "string") return status as TournamentStatus;
-  const statusMap: Record<number, TournamentStatus> = { 0: "idle", 1: "running", 2: "paused", 3: "completed" };
-  return statusMap[status] ?? "idle";
+  return STATUS_BY_CODE[status] ?? "idle";
 }
 
 function mapDifficultyFromBackend(diff: number | string): AIDifficulty {
   if (typeof diff === "string") return diff as AIDifficulty;
-  const diffMap: Record<number, AIDifficulty> = { 1: "beginner", 2: "easy", 3: "normal", 4: "medium", 5: "hard", 6: "harder", 7: "veryHard", 8: "expert", 9: "master", 10: "grandmaster", 11: "legend" };
-  return diffMap[diff] ?? "beginner";
+  return DIFFICULTY_BY_CODE[diff] ?? "beginner";
 }
 
 export interface BoardCell { x: number; y: number; player: string; }
 export interface AIBot { name: string; difficulty: AIDifficulty; elo: number; wins: number; losses: number; draws: number; gamesPlayed: number; winRate: number; }
-export interface CurrentMatchInfo { gameId: string; redBotName: string; blueBotName: string; redDifficulty: AIDifficulty; blueDifficulty: AIDifficulty; moveNumber: number; board: BoardCell[]; redTimeRemainingMs: number; blueTimeRemainingMs: number; initialTimeSeconds: number; incrementSeconds: number; lastMove: { x: number; y: number } | null; lastMoveTimestamp: number; lastMoveStats: EngineStats | null; }
+export interface CurrentMatchInfo { gameId: string; redBotName: string; blueBotName: string; redDifficulty: AIDifficulty; blueDifficulty: AIDifficulty; moveNumber: number; board: Map<number, string>; redTimeRemainingMs: number; blueTimeRemainingMs: number; initialTimeSeconds: number; incrementSeconds: number; lastMove: { x: number; y: number } | null; lastMoveTimestamp: number; lastMoveStats: EngineStats | null; }
 export interface EngineStats { depthAchieved: number; nodesSearched: number; nodesPerSecond: number; tableHitRate: number; ponderingActive: boolean; vcfDepthAchieved: number; vcfNodesSearched: number; }
 export interface TournamentProgress { completed: number; total: number; percent: number; }
 export interface MatchResult { winner: Player; loser: Player; totalMoves: number; durationMs: number; winnerDifficulty: AIDifficulty; loserDifficulty: AIDifficulty; isDraw: boolean; endedByTimeout: boolean; winnerBotName?: string; loserBotName?: string; }
-export interface TournamentState { status: TournamentStatus; progress: TournamentProgress; bots: AIBot[]; matchHistory: MatchResult[]; currentMatch: CurrentMatchInfo | null; startTimeUtc: string; endTimeUtc: string | null; elapsed: string; connectionState: "disconnected" | "connecting" | "connected" | "reconnecting"; errorMessage: string | null; }
+export interface TournamentState { status: TournamentStatus; progress: TournamentProgress; bots: AIBot[]; currentMatch: CurrentMatchInfo | null; startTimeUtc: string; endTimeUtc: string | null; elapsed: string; connectionState: "disconnected" | "connecting" | "connected" | "reconnecting"; errorMessage: string | null; }
+
+// Board cells are keyed by y * boardSize + x so placing a stone is a single O(1) set
+export function boardKey(x: number, y: number): number { return y * GameConfig.boardSize + x; }
+
+function toBoardMap(cells: BoardCell[] | undefined): SvelteMap<number, string> {
+  const board = new SvelteMap<number, string>();
+  for (const cell of cells ?? []) board.set(boardKey(cell.x, cell.y), cell.player);
+  return board;
+}
 
 const API_BASE = "http://localhost:5207/api/tournament";
 const HUB_URL = "http://localhost:5207/hubs/tournament";
+const HISTORY_SIZE = 20;
 
 export class TournamentStore {
-  state = $state<TournamentState>({ status: "idle", progress: { completed: 0, total: 0, percent: 0 }, bots: [], matchHistory: [], currentMatch: null, startTimeUtc: "", endTimeUtc: null, elapsed: "", connectionState: "disconnected", errorMessage: null });
+  state = $state<TournamentState>({ status: "idle", progress: { completed: 0, total: 0, percent: 0 }, bots: [], currentMatch: null, startTimeUtc: "", endTimeUtc: null, elapsed: "", connectionState: "disconnected", errorMessage: null });
+  // Last HISTORY_SIZE results in a fixed ring; historyHead is the slot the next result goes into
+  private historyRing = $state<(MatchResult | null)[]>(new Array(HISTORY_SIZE).fill(null));
+  private historyHead = $state(0);
+  // Memoized views: recomputed only when bots / history change, not on every template read
+  sortedBots = $derived.by(() => [...this.state.bots].sort((a, b) => b.elo - a.elo));
+  matchHistory = $derived.by(() => {
+    const out: MatchResult[] = [];
+    for (let i = 0; i < HISTORY_SIZE; i++) {
+      const entry = this.historyRing[(this.historyHead - 1 - i + HISTORY_SIZE) % HISTORY_SIZE];
+      if (entry) out.push(entry);
+    }
+    return out;
+  });
+  recentMatches = $derived(this.matchHistory); // the ring already caps history at HISTORY_SIZE
   private connection: signalR.HubConnection | null = null;
   private reconnectAttempts = 0;
   private maxReconnectAttempts = 5;
-  private countdownInterval: ReturnType<typeof setInterval> | null = null;
+  private rafId = 0;
+  // Backend enum mappers; swapped for a shape-specific variant once the first fetchState reveals the wire format
+  private mapStatus: (status: number | string) => TournamentStatus = mapStatusFromBackend;
+  private mapDifficulty: (diff: number | string) => AIDifficulty = mapDifficultyFromBackend;
+  private mappersSpecialized = false;
+
+  private specializeMappers(sample: number | string): void {
+    if (typeof sample === "string") {
+      this.mapStatus = (status) => status as TournamentStatus;
+      this.mapDifficulty = (diff) => diff as AIDifficulty;
+    } else {
+      this.mapStatus = (status) => STATUS_BY_CODE[status as number] ?? "idle";
+      this.mapDifficulty = (diff) => DIFFICULTY_BY_CODE[diff as number] ?? "beginner";
+    }
+    this.mappersSpecialized = true;
+  }
 
-  constructor() { this.countdownInterval = setInterval(() => this.updateCountdown(), 100); }
+  // Runs once per animation frame only while a match is in progress; the browser pauses it in background tabs
+  private tick = (): void => {
+    this.rafId = 0;
+    this.updateCountdown();
+    if (this.state.status === "running" && this.state.currentMatch) this.rafId = requestAnimationFrame(this.tick);
+  };
+
+  private startCountdown(): void {
+    if (this.rafId || typeof requestAnimationFrame === "undefined") return;
+    if (this.state.status === "running" && this.state.currentMatch) this.rafId = requestAnimationFrame(this.tick);
+  }
 
   private updateCountdown(): void {
-    if (!this.state.currentMatch || this.state.status !== "running") return;
+    const match = this.state.currentMatch;
+    if (!match || this.state.status !== "running") return;
     const now = Date.now();
-    const elapsed = now - this.state.currentMatch.lastMoveTimestamp;
-    const isRedTurn = this.state.currentMatch.moveNumber % 2 === 0;
-    if (isRedTurn) this.state.currentMatch.redTimeRemainingMs = Math.max(0, this.state.currentMatch.redTimeRemainingMs - elapsed);
-    else this.state.currentMatch.blueTimeRemainingMs = Math.max(0, this.state.currentMatch.blueTimeRemainingMs - elapsed);
-    this.state.currentMatch.lastMoveTimestamp = now;
+    const elapsed = now - match.lastMoveTimestamp;
+    const isRedTurn = match.moveNumber % 2 === 0;
+    const oldMs = isRedTurn ? match.redTimeRemainingMs : match.blueTimeRemainingMs;
+    const newMs = Math.max(0, oldMs - elapsed);
+    // Only touch $state when the displayed second changes; lastMoveTimestamp stays put so elapsed keeps accumulating
+    if (Math.floor(newMs / 1000) === Math.floor(oldMs / 1000)) return;
+    if (isRedTurn) match.redTimeRemainingMs = newMs;
+    else match.blueTimeRemainingMs = newMs;
+    match.lastMoveTimestamp = now;
   }
 
   async connect(): Promise<void> {
@@ -65,38 +126,35 @@ export class TournamentStore {
   }
 
   async disconnect(): Promise<void> {
-    if (this.countdownInterval) { clearInterval(this.countdownInterval); this.countdownInterval = null; }
+    if (this.rafId) { cancelAnimationFrame(this.rafId); this.rafId = 0; }
     if (this.connection) { await this.connection.stop(); this.connection = null; }
     this.state.connectionState = "disconnected";
   }
 
   private setupEventHandlers(): void {
     if (!this.connection) return;
-    this.connection.on("OnGameStarted", (gameId: string, redBot: string, blueBot: string, redDiff: AIDifficulty, blueDiff: AIDifficulty) => {
+    this.connection.on("OnGameStarted", (gameId: string, redBot: string, blueBot: string, redDiff: number | string, blueDiff: number | string) => {
       const now = Date.now();
-      this.state.currentMatch = { gameId, redBotName: redBot, blueBotName: blueBot, redDifficulty: redDiff, blueDifficulty: blueDiff, moveNumber: 0, board: [], redTimeRemainingMs: 420000, blueTimeRemainingMs: 420000, initialTimeSeconds: 420, incrementSeconds: 5, lastMove: null, lastMoveTimestamp: now, lastMoveStats: null };
+      this.state.currentMatch = { gameId, redBotName: redBot, blueBotName: blueBot, redDifficulty: this.mapDifficulty(redDiff), blueDifficulty: this.mapDifficulty(blueDiff), moveNumber: 0, board: new SvelteMap(), redTimeRemainingMs: 420000, blueTimeRemainingMs: 420000, initialTimeSeconds: 420, incrementSeconds: 5, lastMove: null, lastMoveTimestamp: now, lastMoveStats: null };
+      this.startCountdown();
     });
     this.connection.on("OnMovePlayed", (moveEvent: any) => {
-      if (!this.state.currentMatch) return;
-      const now = Date.now();
-      this.state.currentMatch.moveNumber = moveEvent.moveNumber;
-      this.state.currentMatch.redTimeRemainingMs = moveEvent.redTimeRemainingMs;
-      this.state.currentMatch.blueTimeRemainingMs = moveEvent.blueTimeRemainingMs;
-      this.state.currentMatch.lastMove = { x: moveEvent.x, y: moveEvent.y };
-      this.state.currentMatch.lastMoveTimestamp = now;
-      this.state.currentMatch.lastMoveStats = { depthAchieved: moveEvent.depthAchieved || 0, nodesSearched: moveEvent.nodesSearched || 0, nodesPerSecond: moveEvent.nodesPerSecond || 0, tableHitRate: moveEvent.tableHitRate || 0, ponderingActive: moveEvent.ponderingActive || false, vcfDepthAchieved: moveEvent.vcfDepthAchieved || 0, vcfNodesSearched: moveEvent.vcfNodesSearched || 0 };
-      this.state.currentMatch.board = this.state.currentMatch.board.filter(b => b.x !== moveEvent.x || b.y !== moveEvent.y);
-      this.state.currentMatch.board.push({ x: moveEvent.x, y: moveEvent.y, player: moveEvent.player });
+      const match = this.state.currentMatch;
+      if (!match) return;
+      // Place the stone in the (separately reactive) board map, then publish every other field in one assignment
+      match.board.set(boardKey(moveEvent.x, moveEvent.y), moveEvent.player);
+      this.state.currentMatch = { ...match, moveNumber: moveEvent.moveNumber, redTimeRemainingMs: moveEvent.redTimeRemainingMs, blueTimeRemainingMs: moveEvent.blueTimeRemainingMs, lastMove: { x: moveEvent.x, y: moveEvent.y }, lastMoveTimestamp: Date.now(), lastMoveStats: { depthAchieved: moveEvent.depthAchieved || 0, nodesSearched: moveEvent.nodesSearched || 0, nodesPerSecond: moveEvent.nodesPerSecond || 0, tableHitRate: moveEvent.tableHitRate || 0, ponderingActive: moveEvent.ponderingActive || false, vcfDepthAchieved: moveEvent.vcfDepthAchieved || 0, vcfNodesSearched: moveEvent.vcfNodesSearched || 0 } };
     });
     this.connection.on("OnGameFinished", (finished: any) => {
       if (!this.state.currentMatch) return;
       const isRedWinner = finished.winner === "red";
-      this.state.matchHistory = [{ winner: finished.winner, loser: finished.loser, totalMoves: finished.totalMoves, durationMs: finished.durationMs, winnerDifficulty: isRedWinner ? this.state.currentMatch.redDifficulty : this.state.currentMatch.blueDifficulty, loserDifficulty: isRedWinner ? this.state.currentMatch.blueDifficulty : this.state.currentMatch.redDifficulty, isDraw: finished.isDraw, endedByTimeout: finished.endedByTimeout, winnerBotName: isRedWinner ? this.state.currentMatch.redBotName : this.state.currentMatch.blueBotName, loserBotName: isRedWinner ? this.state.currentMatch.blueBotName : this.state.currentMatch.redBotName }, ...this.state.matchHistory.slice(0, 19)];
+      this.historyRing[this.historyHead] = { winner: finished.winner, loser: finished.loser, totalMoves: finished.totalMoves, durationMs: finished.durationMs, winnerDifficulty: isRedWinner ? this.state.currentMatch.redDifficulty : this.state.currentMatch.blueDifficulty, loserDifficulty: isRedWinner ? this.state.currentMatch.blueDifficulty : this.state.currentMatch.redDifficulty, isDraw: finished.isDraw, endedByTimeout: finished.endedByTimeout, winnerBotName: isRedWinner ? this.state.currentMatch.redBotName : this.state.currentMatch.blueBotName, loserBotName: isRedWinner ? this.state.currentMatch.blueBotName : this.state.currentMatch.redBotName };
+      this.historyHead = (this.historyHead + 1) % HISTORY_SIZE;
     });
     this.connection.on("OnTournamentProgress", (completed: number, total: number, percent: number, currentMatch: string) => { this.state.progress = { completed, total, percent }; });
     this.connection.on("OnTournamentCompleted", (finalStandings: AIBot[], totalGames: number, durationMs: number) => { this.state.status = "completed"; this.state.bots = finalStandings; this.state.progress = { completed: totalGames, total: totalGames, percent: 100 }; this.state.endTimeUtc = new Date().toISOString(); this.state.elapsed = formatDuration(durationMs); });
-    this.connection.on("OnTournamentStatusChanged", (status: number | string, message: string) => { this.state.status = mapStatusFromBackend(status); if (this.state.status === "running" && !this.state.startTimeUtc) this.state.startTimeUtc = new Date().toISOString(); });
-    this.connection.on("OnELOUpdated", (bots: AIBot[]) => { this.state.bots = bots.sort((a, b) => b.elo - a.elo); });
+    this.connection.on("OnTournamentStatusChanged", (status: number | string, message: string) => { this.state.status = this.mapStatus(status); if (this.state.status === "running" && !this.state.startTimeUtc) this.state.startTimeUtc = new Date().toISOString(); this.startCountdown(); });
+    this.connection.on("OnELOUpdated", (bots: AIBot[]) => { this.state.bots = bots; });
   }
 
   async fetchState(): Promise<void> {
@@ -104,13 +162,18 @@ export class TournamentStore {
       const response = await fetch(API_BASE + "/state");
       if (!response.ok) throw new Error("Failed to fetch state");
       const data = await response.json();
-      this.state.status = mapStatusFromBackend(data.status);
+      if (!this.mappersSpecialized) this.specializeMappers(data.status);
+      this.state.status = this.mapStatus(data.status);
       this.state.progress = { completed: data.completedGames, total: data.totalGames, percent: data.progressPercent };
-      this.state.bots = (data.bots || []).sort((a: AIBot, b: AIBot) => b.elo - a.elo);
-      this.state.matchHistory = (data.matchHistory || []).map((m: any) => ({ winner: m.winner, loser: m.loser, totalMoves: m.totalMoves, durationMs: m.durationMs, winnerDifficulty: mapDifficultyFromBackend(m.winnerDifficulty), loserDifficulty: mapDifficultyFromBackend(m.loserDifficulty), isDraw: m.isDraw, endedByTimeout: m.endedByTimeout, winnerBotName: m.winnerBotName, loserBotName: m.loserBotName }));
-      this.state.currentMatch = data.currentMatch ? { ...data.currentMatch, redDifficulty: mapDifficultyFromBackend(data.currentMatch.redDifficulty), blueDifficulty: mapDifficultyFromBackend(data.currentMatch.blueDifficulty), lastMoveStats: null } : null;
+      this.state.bots = data.bots || [];
+      // Backend history is oldest-first; keep the newest HISTORY_SIZE in ring order
+      const history: MatchResult[] = (data.matchHistory || []).slice(-HISTORY_SIZE).map((m: any) => ({ winner: m.winner, loser: m.loser, totalMoves: m.totalMoves, durationMs: m.durationMs, winnerDifficulty: this.mapDifficulty(m.winnerDifficulty), loserDifficulty: this.mapDifficulty(m.loserDifficulty), isDraw: m.isDraw, endedByTimeout: m.endedByTimeout, winnerBotName: m.winnerBotName, loserBotName: m.loserBotName }));
+      this.historyRing = [...history, ...new Array(HISTORY_SIZE - history.length).fill(null)];
+      this.historyHead = history.length % HISTORY_SIZE;
+      this.state.currentMatch = data.currentMatch ? { ...data.currentMatch, board: toBoardMap(data.currentMatch.board), redDifficulty: this.mapDifficulty(data.currentMatch.redDifficulty), blueDifficulty: this.mapDifficulty(data.currentMatch.blueDifficulty), lastMoveStats: null } : null;
       this.state.startTimeUtc = data.startTimeUtc || "";
       this.state.endTimeUtc = data.endTimeUtc || null;
+      this.startCountdown();
     } catch (err) { console.error("Failed to fetch:", err); }
   }
 
@@ -131,8 +194,6 @@ export class TournamentStore {
     try { const response = await fetch(API_BASE + "/resume", { method: "POST" }); if (!response.ok) return false; await this.fetchState(); return true; } catch (err) { this.state.errorMessage = "Failed to resume: " + (err as Error).message; return false; }
   }
 
-  get sortedBots(): AIBot[] { return [...this.state.bots].sort((a, b) => b.elo - a.elo); }
-  get recentMatches(): MatchResult[] { return this.state.matchHistory.slice(0, 50); }
   formatTime(ms: number): string { const seconds = Math.floor(ms / 1000); const minutes = Math.floor(seconds / 60); return minutes + ":" + (seconds % 60).toString().padStart(2, "0"); }
   formatELOChange(bot: AIBot): string { const change = bot.elo - 600; return change >= 0 ? "+" + change : String(change); }
   getELOChangeClass(bot: AIBot): string { const change = bot.elo - 600; if (change > 0) return "text-green-600"; if (change < 0) return "text-red-600"; return "text-gray-500"; }
@@ -149,7 +210,18 @@ function formatDuration(ms: number): string {
 export const tournamentStore = new TournamentStore();
 """
 
-with open('src/lib/stores/tournamentStore.svelte.ts', 'w') as f:
-    f.write(content)
-
-print("File written successfully")
+STORE_PATH = 'src/lib/stores/tournamentStore.svelte.ts'
+
+# Skip the write when the store is already current so mtime and Vite's cache stay valid
+try:
+    with open(STORE_PATH, 'rb') as f:
+        old = f.read()
+except FileNotFoundError:
+    old = b''
+
+if hashlib.blake2b(old, digest_size=16).digest() == hashlib.blake2b(content, digest_size=16).digest():
+    print("File already up to date")
+else:
+    with open(STORE_PATH, 'wb') as f:
+        f.write(content)
+    print("File written successfully")